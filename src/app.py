@@ -4,14 +4,23 @@ Budget Tracker Flask REST API
 This module provides a REST API for the Budget Tracker application.
 """
 
-from flask import Flask, request, jsonify, render_template
-from datetime import datetime
+from flask import Flask, Response, request, render_template
+from flask.json.provider import JSONProvider
+from datetime import datetime, timezone
 from decimal import Decimal
-import json
+from functools import lru_cache
+import gzip
+import hashlib
+import msgpack
+import orjson
 from typing import Dict, Any
 
-# Use absolute import for local development compatibility
-from budget_tracker import BudgetTracker, Expense
+# Use absolute import for local development compatibility, and the package
+# import when the app is loaded as src.app (as the tests do)
+try:
+    from .budget_tracker import BudgetTracker, Expense
+except ImportError:
+    from budget_tracker import BudgetTracker, Expense
 
 # Create Flask application
 app = Flask(__name__)
@@ -19,44 +28,222 @@ app = Flask(__name__)
 # Create a single instance of BudgetTracker to be used across all requests
 budget_tracker = BudgetTracker()
 
-# Custom JSON encoder to handle Decimal and datetime objects
-class CustomJSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return str(obj)
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
+# Fields that must be present when adding an expense
+_REQUIRED_EXPENSE_FIELDS = ("amount", "category", "date")
+_REQUIRED_EXPENSE_FIELD_SET = frozenset(_REQUIRED_EXPENSE_FIELDS)
 
-app.json_encoder = CustomJSONEncoder
+# Response media types offered through content negotiation
+_JSON_MIMETYPE = 'application/json'
+_MSGPACK_MIMETYPE = 'application/msgpack'
+
+# Base headers for each negotiated media type, built once so responses skip
+# mimetype parsing and the separate Vary update
+_BASE_HEADERS = {
+    _JSON_MIMETYPE: {'Content-Type': _JSON_MIMETYPE, 'Vary': 'Accept'},
+    _MSGPACK_MIMETYPE: {'Content-Type': _MSGPACK_MIMETYPE, 'Vary': 'Accept'},
+}
+
+# Response bodies below this size (in bytes) are sent uncompressed
+_COMPRESS_MIN_SIZE = 512
+
+# msgpack has no datetime type, so dates are sent as ISO strings like in JSON
+def _msgpack_default(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not msgpack serializable")
+
+# Encoders for each negotiated media type. Payloads hold only primitives and
+# datetimes (which orjson handles natively); amounts are formatted by the
+# handlers, so orjson needs no Python-level default hook.
+_ENCODERS = {
+    _JSON_MIMETYPE: orjson.dumps,
+    _MSGPACK_MIMETYPE: lambda payload: msgpack.packb(payload, default=_msgpack_default),
+}
+
+def _encode_all(payload: Any) -> Dict[str, bytes]:
+    """Pre-encode a fixed payload for every negotiated media type."""
+    return {mimetype: encode(payload) for mimetype, encode in _ENCODERS.items()}
+
+# Helper function to pick the response media type
+def _negotiate() -> str:
+    """Return msgpack if the Accept header ranks it above JSON, else JSON."""
+    best = request.accept_mimetypes.best_match((_JSON_MIMETYPE, _MSGPACK_MIMETYPE))
+    return _MSGPACK_MIMETYPE if best == _MSGPACK_MIMETYPE else _JSON_MIMETYPE
+
+# Helper function to wrap an encoded body in a response
+def _respond(body: bytes, mimetype: str, status: int = 200) -> Response:
+    """Build a response, gzip-compressing larger bodies when the client accepts it."""
+    response = Response(body, status=status, headers=_BASE_HEADERS[mimetype])
+    if len(body) >= _COMPRESS_MIN_SIZE:
+        response.vary.add('Accept-Encoding')
+        if request.accept_encodings['gzip']:
+            response.set_data(gzip.compress(body, compresslevel=6, mtime=0))
+            response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+# Helper function to build a JSON response
+def _json(payload: Any, status: int = 200) -> Response:
+    """
+    Serialize a payload with orjson and wrap it in a JSON response.
+    
+    Clients that ask for application/msgpack get the same payload encoded
+    with msgpack instead.
+    """
+    mimetype = _negotiate()
+    return _respond(_ENCODERS[mimetype](payload), mimetype, status)
+
+# Helper function to format a Decimal amount for JSON output
+def format_amount(amount: Decimal) -> str:
+    """Format an amount in plain (non-exponent) notation."""
+    return format(amount, 'f')
+
+# orjson fallback for the types it does not encode natively
+def _orjson_default(obj):
+    if isinstance(obj, Decimal):
+        return format_amount(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class _OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+    
+    The API handlers encode their own responses, but this keeps jsonify,
+    request.get_json and Flask's own JSON use on the same fast encoder, with
+    Decimal amounts formatted as in the API. Like Flask's default provider it
+    sorts keys (unless sort_keys is turned off) and accepts non-string keys.
+    """
+    
+    sort_keys = True
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get('default', _orjson_default),
+                            option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+app.json = _OrjsonProvider(app)
+
+# Pre-encoded bodies for the common empty results (new users, narrow ranges)
+_EMPTY_EXPENSES = _encode_all({"expenses": []})
+_EMPTY_SUMMARY = _encode_all({
+    "summary": {},
+    "total": format_amount(Decimal('0.00')),
+    "filters": {"start_date": None, "end_date": None}
+})
 
 # Helper function to parse date strings
+@lru_cache(maxsize=4096)
 def parse_date(date_str: str) -> datetime:
-    """Parse a date string in ISO format."""
+    """
+    Parse a date string in ISO format.
+    
+    Results are cached on the raw string since clients tend to repeat the
+    same dates and ranges; datetime objects are immutable, so sharing is safe.
+    Timestamps with a UTC offset are converted to naive UTC, so every stored
+    and queried date can be ordered against the others.
+    """
+    # fromisoformat accepts plain dates (YYYY-MM-DD) as well as full
+    # timestamps, so no slower strptime fallback is needed
     try:
-        return datetime.fromisoformat(date_str)
+        date = datetime.fromisoformat(date_str)
     except ValueError:
-        # Try to parse as just a date (without time)
-        try:
-            return datetime.strptime(date_str, "%Y-%m-%d")
-        except ValueError:
-            raise ValueError(f"Invalid date format: {date_str}. Use ISO format (YYYY-MM-DD).")
+        raise ValueError(f"Invalid date format: {date_str}. Use ISO format (YYYY-MM-DD).")
+    if date.tzinfo is not None:
+        date = date.astimezone(timezone.utc).replace(tzinfo=None)
+    return date
 
-# Helper function to convert Expense object to dictionary
-def expense_to_dict(expense: Expense) -> Dict[str, Any]:
-    """Convert an Expense object to a dictionary for JSON serialization."""
+# Helper function to parse the optional date range query parameters
+def _parse_range_args():
+    """
+    Parse the optional start_date/end_date query parameters.
+    
+    Returns:
+        A (start_date, end_date, error) tuple, where error is a 400 response
+        if either date is invalid and None otherwise
+    """
+    args = request.args
+    try:
+        start_date = parse_date(args['start_date']) if 'start_date' in args else None
+        end_date = parse_date(args['end_date']) if 'end_date' in args else None
+    except ValueError as e:
+        return None, None, _json({"error": str(e)}, 400)
+    return start_date, end_date, None
+
+# Helper function to read the JSON request body
+def _json_body():
+    """
+    Parse the request body with orjson without caching the raw bytes.
+    
+    Returns:
+        A (data, error) tuple, where error is a 400 response if the body is
+        not valid JSON and None otherwise; an empty body yields None data
+    """
+    try:
+        return orjson.loads(request.get_data(cache=False) or b'null'), None
+    except orjson.JSONDecodeError:
+        return None, _json({"error": "Invalid JSON"}, 400)
+
+# Builds the dictionary that expense_to_dict caches on each expense
+def _build_expense_dict(expense: Expense) -> Dict[str, Any]:
     return {
         "id": expense.id,
-        "amount": str(expense.amount),
+        "amount": format_amount(expense.amount),
         "category": expense.category,
-        "date": expense.date.isoformat(),
+        "date": expense.date,
         "description": expense.description
     }
 
+# Helper function to convert Expense object to dictionary
+def expense_to_dict(expense: Expense) -> Dict[str, Any]:
+    """
+    Convert an Expense object to a dictionary for JSON serialization.
+    
+    The dictionary is cached on the expense and reused until the expense
+    is updated, so repeated reads skip the Decimal formatting work.
+    """
+    return expense.cached('dict', _build_expense_dict)
+
+# Builds the JSON fragment that expense_to_json caches on each expense
+def _build_expense_json(expense: Expense) -> bytes:
+    return orjson.dumps(expense_to_dict(expense))
+
+# Helper function to get the JSON encoding of a single expense
+def expense_to_json(expense: Expense) -> bytes:
+    """
+    Get the orjson encoding of an expense, cached until the expense is
+    updated so listings can splice the cached fragments together.
+    """
+    return expense.cached('json', _build_expense_json)
+
+# Rendered index page and its ETag, filled in on the first request
+_index_page = None
+
 @app.route('/')
 def index():
-    """Render the main HTML interface."""
-    return render_template('index.html')
+    """
+    Render the main HTML interface.
+    
+    The page has no per-request data, so it is rendered once (on the first
+    request, where url_for has a request context) and then served from memory
+    with an ETag and cache headers; matching If-None-Match requests get a 304.
+    """
+    global _index_page
+    if _index_page is None:
+        body = render_template('index.html').encode('utf-8')
+        _index_page = (body, hashlib.md5(body, usedforsecurity=False).hexdigest())
+    
+    body, etag = _index_page
+    response = Response(body, mimetype='text/html')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response.make_conditional(request)
 
 @app.route('/expense', methods=['POST'])
 def add_expense():
@@ -71,16 +258,18 @@ def add_expense():
         "description": "Weekly grocery shopping"
     }
     """
-    data = request.json
+    data, error = _json_body()
+    if error is not None:
+        return error
     
     if not data:
-        return jsonify({"error": "No data provided"}), 400
+        return _json({"error": "No data provided"}, 400)
     
-    # Validate required fields
-    required_fields = ["amount", "category", "date"]
-    for field in required_fields:
-        if field not in data:
-            return jsonify({"error": f"Missing required field: {field}"}), 400
+    # Validate required fields with a single set check; only look for the
+    # first missing field (in declared order) when something is absent
+    if not _REQUIRED_EXPENSE_FIELD_SET.issubset(data):
+        field = next(f for f in _REQUIRED_EXPENSE_FIELDS if f not in data)
+        return _json({"error": f"Missing required field: {field}"}, 400)
     
     try:
         # Parse the date
@@ -95,13 +284,13 @@ def add_expense():
         )
         
         # Return the created expense
-        return jsonify({
+        return _json({
             "message": "Expense added successfully",
             "expense": expense_to_dict(expense)
-        }), 201
+        }, 201)
     
     except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+        return _json({"error": str(e)}, 400)
 
 @app.route('/expense/<expense_id>', methods=['PUT'])
 def update_expense(expense_id):
@@ -116,10 +305,12 @@ def update_expense(expense_id):
         "description": "Movie tickets"
     }
     """
-    data = request.json
+    data, error = _json_body()
+    if error is not None:
+        return error
     
     if not data:
-        return jsonify({"error": "No data provided"}), 400
+        return _json({"error": "No data provided"}, 400)
     
     try:
         # Parse the date if provided
@@ -137,16 +328,16 @@ def update_expense(expense_id):
         )
         
         if expense is None:
-            return jsonify({"error": f"Expense with ID {expense_id} not found"}), 404
+            return _json({"error": f"Expense with ID {expense_id} not found"}, 404)
         
         # Return the updated expense
-        return jsonify({
+        return _json({
             "message": "Expense updated successfully",
             "expense": expense_to_dict(expense)
         })
     
     except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+        return _json({"error": str(e)}, 400)
 
 @app.route('/expense/<expense_id>', methods=['DELETE'])
 def delete_expense(expense_id):
@@ -154,14 +345,17 @@ def delete_expense(expense_id):
     success = budget_tracker.delete_expense(expense_id)
     
     if not success:
-        return jsonify({"error": f"Expense with ID {expense_id} not found"}), 404
+        return _json({"error": f"Expense with ID {expense_id} not found"}, 404)
     
-    return jsonify({"message": f"Expense with ID {expense_id} deleted successfully"})
+    return _json({"message": f"Expense with ID {expense_id} deleted successfully"})
 
 @app.route('/expense', methods=['GET'])
 def get_expenses():
     """
-    Get all expenses, optionally filtered by date range.
+    Get all expenses, optionally filtered by date range and category.
+    
+    Expenses are always listed in date order, with expenses sharing a date
+    in the order they were added.
     
     Query parameters:
     - start_date: Optional start date for filtering (ISO format)
@@ -169,39 +363,26 @@ def get_expenses():
     - category: Optional category for filtering
     """
     # Parse date filters if provided
-    start_date = None
-    end_date = None
+    start_date, end_date, error = _parse_range_args()
+    if error is not None:
+        return error
     category = request.args.get('category')
     
-    if 'start_date' in request.args:
-        try:
-            start_date = parse_date(request.args['start_date'])
-        except ValueError as e:
-            return jsonify({"error": str(e)}), 400
-    
-    if 'end_date' in request.args:
-        try:
-            end_date = parse_date(request.args['end_date'])
-        except ValueError as e:
-            return jsonify({"error": str(e)}), 400
-    
-    # Get expenses with optional date filtering
-    if category:
-        # If category is provided, filter by category
-        expenses = budget_tracker.get_expenses_by_category(category)
-        # Apply date filtering if needed
-        if start_date or end_date:
-            expenses = [e for e in expenses if 
-                       (start_date is None or e.date >= start_date) and
-                       (end_date is None or e.date <= end_date)]
-    else:
-        # Otherwise, get all expenses with optional date filtering
-        expenses = budget_tracker.get_expenses(start_date, end_date)
-    
-    # Convert expenses to dictionaries for JSON serialization
+    # Get expenses with optional category and date filtering in one pass
+    expenses = budget_tracker.get_expenses(start_date, end_date, category or None)
+    mimetype = _negotiate()
+    if not expenses:
+        return _respond(_EMPTY_EXPENSES[mimetype], mimetype)
+    
+    if mimetype == _JSON_MIMETYPE:
+        # Splice the cached per-expense JSON instead of re-encoding the list
+        body = b'{"expenses":[' + b','.join([expense_to_json(e) for e in expenses]) + b']}'
+        return _respond(body, mimetype)
+    
+    # Convert expenses to dictionaries for serialization
     expenses_dict = [expense_to_dict(expense) for expense in expenses]
     
-    return jsonify({"expenses": expenses_dict})
+    return _respond(_ENCODERS[mimetype]({"expenses": expenses_dict}), mimetype)
 
 @app.route('/balance', methods=['GET'])
 def get_balance():
@@ -213,29 +394,18 @@ def get_balance():
     - end_date: Optional end date for filtering (ISO format)
     """
     # Parse date filters if provided
-    start_date = None
-    end_date = None
-    
-    if 'start_date' in request.args:
-        try:
-            start_date = parse_date(request.args['start_date'])
-        except ValueError as e:
-            return jsonify({"error": str(e)}), 400
-    
-    if 'end_date' in request.args:
-        try:
-            end_date = parse_date(request.args['end_date'])
-        except ValueError as e:
-            return jsonify({"error": str(e)}), 400
+    start_date, end_date, error = _parse_range_args()
+    if error is not None:
+        return error
     
     # Get total expenses with optional date filtering
     total = budget_tracker.get_total_expenses(start_date, end_date)
     
-    return jsonify({
-        "balance": str(total),
+    return _json({
+        "balance": format_amount(total),
         "filters": {
-            "start_date": start_date.isoformat() if start_date else None,
-            "end_date": end_date.isoformat() if end_date else None
+            "start_date": start_date,
+            "end_date": end_date
         }
     })
 
@@ -249,38 +419,42 @@ def get_summary():
     - end_date: Optional end date for filtering (ISO format)
     """
     # Parse date filters if provided
-    start_date = None
-    end_date = None
+    start_date, end_date, error = _parse_range_args()
+    if error is not None:
+        return error
     
-    if 'start_date' in request.args:
-        try:
-            start_date = parse_date(request.args['start_date'])
-        except ValueError as e:
-            return jsonify({"error": str(e)}), 400
-    
-    if 'end_date' in request.args:
-        try:
-            end_date = parse_date(request.args['end_date'])
-        except ValueError as e:
-            return jsonify({"error": str(e)}), 400
-    
-    # Get category summary with optional date filtering
-    summary = budget_tracker.get_category_summary(start_date, end_date)
+    # Get category summary and total with optional date filtering, from
+    # one pass so the amounts always add up to the total
+    summary, total = budget_tracker.get_summary(start_date, end_date)
+    if not summary and start_date is None and end_date is None:
+        mimetype = _negotiate()
+        return _respond(_EMPTY_SUMMARY[mimetype], mimetype)
     
     # Convert Decimal values to strings for JSON serialization
-    summary_dict = {category: str(amount) for category, amount in summary.items()}
-    
-    # Get total expenses
-    total = budget_tracker.get_total_expenses(start_date, end_date)
+    summary_dict = {category: format_amount(amount) for category, amount in summary.items()}
     
-    return jsonify({
+    return _json({
         "summary": summary_dict,
-        "total": str(total),
+        "total": format_amount(total),
         "filters": {
-            "start_date": start_date.isoformat() if start_date else None,
-            "end_date": end_date.isoformat() if end_date else None
+            "start_date": start_date,
+            "end_date": end_date
         }
     })
 
+@app.route('/export', methods=['GET'])
+def export_expenses():
+    """
+    Download all expenses as a CSV file.
+    
+    The CSV is streamed in chunks as it is generated, so large exports start
+    sending immediately and are never held in memory in full.
+    """
+    return Response(
+        budget_tracker.export_to_csv_stream(),
+        mimetype='text/csv',
+        headers={'Content-Disposition': 'attachment; filename=expense_summary.csv'}
+    )
+
 if __name__ == '__main__':
     app.run(debug=False, host='0.0.0.0', port=5000)
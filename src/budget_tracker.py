@@ -4,11 +4,136 @@ Budget Tracker Module
 This module provides classes for tracking expenses and generating summaries by category.
 """
 
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache, wraps
+from operator import attrgetter
+import io
+import os
+import threading
 import uuid
-import csv
-from typing import Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, TextIO, Tuple, Union
+
+
+# Maximum number of date ranges whose summaries are cached between writes
+_SUMMARY_CACHE_SIZE = 256
+
+# Maximum number of distinct amount strings whose parses are cached
+_AMOUNT_CACHE_SIZE = 4096
+
+# Write buffer size for CSV exports
+_EXPORT_BUFFER_SIZE = 1 << 20
+
+# Expense rows per chunk when streaming a CSV export
+_EXPORT_CHUNK_ROWS = 1000
+
+
+def _parse_amount(amount: Union[Decimal, str, int]) -> Tuple[Decimal, int]:
+    """
+    Validate an expense amount and convert it to whole cents.
+    
+    Totals are summed as integer cents, so amounts must be finite and have
+    no fractional cents.
+    
+    Args:
+        amount: The amount as a Decimal or a value convertible to Decimal
+        
+    Returns:
+        Tuple of (amount as a Decimal, amount in cents)
+        
+    Raises:
+        ValueError: If the amount is invalid
+    """
+    # Whole numbers need no parsing or range checks
+    if type(amount) is int:
+        return Decimal(amount), amount * 100
+    if isinstance(amount, Decimal):
+        return _decimal_to_cents(amount)
+    # Anything else is parsed from its text form, which is cached because
+    # clients send the same amounts over and over
+    return _parse_amount_text(str(amount))
+
+
+@lru_cache(maxsize=_AMOUNT_CACHE_SIZE)
+def _parse_amount_text(text: str) -> Tuple[Decimal, int]:
+    """Parse and validate an amount given as text (see _parse_amount)."""
+    try:
+        amount = Decimal(text)
+    except (InvalidOperation, ValueError):
+        raise ValueError("Please enter a valid amount") from None
+    return _decimal_to_cents(amount)
+
+
+def _decimal_to_cents(amount: Decimal) -> Tuple[Decimal, int]:
+    """Validate a Decimal amount and convert it to cents (see _parse_amount)."""
+    try:
+        cents = amount.scaleb(2)
+        if cents.is_finite() and cents == cents.to_integral_value():
+            return amount, int(cents)
+    except ArithmeticError:
+        # InvalidOperation for signaling NaNs, Overflow for huge exponents
+        pass
+    raise ValueError("Please enter a valid amount")
+
+
+def _validate_expense(amount: Union[Decimal, str, int], category: str) -> Tuple[Decimal, int]:
+    """
+    Validate the amount and category of a new expense.
+    
+    Args:
+        amount: The amount as a Decimal or a value convertible to Decimal
+        category: The expense category
+        
+    Returns:
+        Tuple of (amount as a Decimal, amount in cents)
+        
+    Raises:
+        ValueError: If the amount is invalid or the category is missing
+    """
+    amount, amount_cents = _parse_amount(amount)
+    if not category:
+        raise ValueError("Please select a category")
+    return amount, amount_cents
+
+
+def _from_cents(cents: int) -> Decimal:
+    """Convert an amount in cents back to a two-place Decimal."""
+    return Decimal(cents).scaleb(-2)
+
+
+def _open_export(filename: Union[str, os.PathLike]) -> TextIO:
+    """
+    Open an export file for writing text.
+    
+    A large write buffer batches rows into few writes without holding the
+    whole export in memory. Filenames ending in ".gz" are compressed at the
+    fastest level, which cuts the bytes written for little CPU.
+    
+    Args:
+        filename: The name or path of the file to export to
+        
+    Returns:
+        A text file object
+    """
+    filename = os.fspath(filename)
+    if filename.endswith('.gz'):
+        import gzip
+        return io.TextIOWrapper(
+            io.BufferedWriter(gzip.open(filename, 'wb', compresslevel=1),
+                              _EXPORT_BUFFER_SIZE),
+            newline='')
+    return open(filename, 'w', newline='', buffering=_EXPORT_BUFFER_SIZE)
+
+
+def _locked(method):
+    """Run a BudgetTracker method while holding the tracker's lock."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class Expense:
@@ -16,8 +141,13 @@ class Expense:
     Represents an individual expense with amount, category, date, and description.
     """
     
+    # Fixed attributes avoid a per-instance __dict__
+    __slots__ = ('id', 'amount', 'amount_cents', 'category', 'date',
+                 'description', '_derived')
+    
     def __init__(self, amount: Decimal, category: str, date: datetime, 
-                 description: str = "", expense_id: str = None):
+                 description: str = "", expense_id: str = None,
+                 amount_cents: int = None):
         """
         Initialize a new Expense.
         
@@ -27,12 +157,46 @@ class Expense:
             date: The date of the expense
             description: Optional description of the expense
             expense_id: Optional unique identifier (generated if not provided)
+            amount_cents: Optional amount in cents (derived from amount if not provided)
         """
         self.id = expense_id if expense_id else str(uuid.uuid4())
         self.amount = amount
+        # Integer copy of the amount used for fast, exact summation
+        self.amount_cents = (amount_cents if amount_cents is not None
+                             else _parse_amount(amount)[1])
         self.category = category
         self.date = date
         self.description = description
+        # Values derived from the fields through cached(), by name
+        self._derived: Dict[str, Any] = {}
+    
+    def cached(self, key: str, build: Callable[['Expense'], Any]) -> Any:
+        """
+        Get a value derived from this expense, building it on first use.
+        
+        The value is reused until the expense is next changed. A value built
+        while the expense is being changed is returned but never reused, so
+        a concurrent update cannot leave stale values cached.
+        
+        Args:
+            key: Name of the derived value
+            build: Function computing the value from the expense
+            
+        Returns:
+            The cached or newly built value
+        """
+        # Take the cache before reading any field: invalidate() replaces it,
+        # so a value built from fields that change meanwhile is stored in a
+        # cache that is already discarded
+        derived = self._derived
+        value = derived.get(key)
+        if value is None:
+            value = derived[key] = build(self)
+        return value
+    
+    def invalidate(self):
+        """Discard the values cached by cached(), after the fields have changed."""
+        self._derived = {}
     
     def __eq__(self, other):
         """
@@ -47,17 +211,158 @@ class Expense:
         if not isinstance(other, Expense):
             return False
         return self.id == other.id
+    
+    def __hash__(self):
+        """Hash an expense by its ID, consistent with __eq__."""
+        return hash(self.id)
+
+
+class _DateIndex:
+    """
+    Keeps expenses sorted by date, with parallel columns of their dates,
+    amounts in cents, and categories.
+    
+    Date-range queries binary search the date column instead of scanning
+    every expense, and range totals read the flat columns rather than
+    loading attributes from each Expense object.
+    """
+    
+    def __init__(self):
+        """Initialize an empty date index."""
+        self._dates: List[datetime] = []
+        self._expenses: List[Expense] = []
+        self._cents: List[int] = []
+        self._categories: List[str] = []
+    
+    def __len__(self) -> int:
+        """Get the number of indexed expenses."""
+        return len(self._expenses)
+    
+    def insert(self, expense: Expense):
+        """
+        Insert an expense at its date position.
+        
+        Expenses sharing a date keep their insertion order.
+        """
+        i = bisect_right(self._dates, expense.date)
+        self._dates.insert(i, expense.date)
+        self._expenses.insert(i, expense)
+        self._cents.insert(i, expense.amount_cents)
+        self._categories.insert(i, expense.category)
+    
+    def check_date(self, date: datetime):
+        """
+        Check that a date can be ordered against the indexed dates.
+        
+        Raises:
+            TypeError: If the date cannot be compared with the indexed dates
+                (for example a timezone-aware date among naive ones)
+        """
+        bisect_right(self._dates, date)
+    
+    def extend(self, expenses: List[Expense]):
+        """
+        Insert several expenses with a single sort.
+        
+        The indexed expenses are already in order, so the stable sort mostly
+        merges them with the new ones. Expenses sharing a date keep their
+        insertion order, as with insert.
+        """
+        merged = sorted(self._expenses + expenses, key=attrgetter('date'))
+        self._expenses = merged
+        self._dates = [expense.date for expense in merged]
+        self._cents = [expense.amount_cents for expense in merged]
+        self._categories = [expense.category for expense in merged]
+    
+    def remove(self, expense: Expense):
+        """Remove an expense, using its indexed date to locate it."""
+        i = bisect_left(self._dates, expense.date)
+        while self._expenses[i] is not expense:
+            i += 1
+        del self._dates[i]
+        del self._expenses[i]
+        del self._cents[i]
+        del self._categories[i]
+    
+    def _bounds(self, start_date: datetime = None, 
+                end_date: datetime = None) -> Tuple[int, int]:
+        """Get the slice bounds covering an inclusive date range."""
+        lo = 0 if start_date is None else bisect_left(self._dates, start_date)
+        hi = (len(self._dates) if end_date is None
+              else bisect_right(self._dates, end_date))
+        return lo, hi
+    
+    def range(self, start_date: datetime = None, 
+              end_date: datetime = None) -> List[Expense]:
+        """
+        Get the expenses dated within an inclusive range, in date order.
+        
+        Args:
+            start_date: Optional lower bound
+            end_date: Optional upper bound
+            
+        Returns:
+            List of Expense objects
+        """
+        lo, hi = self._bounds(start_date, end_date)
+        return self._expenses[lo:hi]
+    
+    def totals(self, start_date: datetime = None, 
+               end_date: datetime = None) -> Tuple[Dict[str, int], int]:
+        """
+        Get per-category and overall totals in cents for an inclusive date range.
+        
+        Args:
+            start_date: Optional lower bound
+            end_date: Optional upper bound
+            
+        Returns:
+            Tuple of (category totals in cents, total in cents)
+        """
+        lo, hi = self._bounds(start_date, end_date)
+        cents = self._cents[lo:hi]
+        summary = {}
+        for category, amount in zip(self._categories[lo:hi], cents):
+            summary[category] = summary.get(category, 0) + amount
+        return summary, sum(cents)
 
 
 class BudgetTracker:
     """
     Manages expenses and provides methods for tracking and summarizing expenses.
+    
+    A tracker can be shared between threads: writes and reads of the
+    expenses are serialized by a lock.
     """
     
     def __init__(self):
-        """Initialize a new BudgetTracker with an empty list of expenses."""
-        self._expenses = []
+        """Initialize a new BudgetTracker with no expenses."""
+        # Expenses keyed by id, in insertion order
+        self._expenses: Dict[str, Expense] = {}
+        # Guards the expenses against concurrent requests
+        self._lock = threading.Lock()
+        # Per-category date indexes, kept in sync on every write
+        self._by_category: Dict[str, _DateIndex] = defaultdict(_DateIndex)
+        # Expenses ordered by date for range queries
+        self._by_date = _DateIndex()
+        # Running totals in cents for the unfiltered summary
+        self._category_totals: Dict[str, int] = {}
+        self._total_cents = 0
+        # (category summary, total) per (start_date, end_date), cleared on writes
+        self._summary_cache: Dict[tuple, Tuple[Dict[str, Decimal], Decimal]] = {}
+    
+    def __getstate__(self):
+        """Copy the tracker state without its lock, which cannot be copied."""
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+    
+    def __setstate__(self, state):
+        """Restore a copied tracker with a fresh lock."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
     
+    @_locked
     def add_expense(self, amount: Union[Decimal, str], category: str, 
                    date: datetime, description: str = "") -> Expense:
         """
@@ -74,23 +379,73 @@ class BudgetTracker:
             
         Raises:
             ValueError: If amount is invalid or category is missing
+            TypeError: If the date cannot be ordered against the other
+                expense dates
         """
-        # Validate amount
-        try:
-            if not isinstance(amount, Decimal):
-                amount = Decimal(str(amount))
-        except (InvalidOperation, ValueError):
-            raise ValueError("Please enter a valid amount")
-        
-        # Validate category
-        if not category:
-            raise ValueError("Please select a category")
+        amount, amount_cents = _validate_expense(amount, category)
         
         # Create and add the expense
-        expense = Expense(amount, category, date, description)
-        self._expenses.append(expense)
+        expense = Expense(amount, category, date, description,
+                          amount_cents=amount_cents)
+        # Index by date first: it is the only step that compares values
+        self._by_date.insert(expense)
+        self._expenses[expense.id] = expense
+        self._by_category[category].insert(expense)
+        self._adjust_totals(expense, 1)
+        self._summary_cache.clear()
         return expense
     
+    @_locked
+    def add_expenses(self, expenses: Iterable[Mapping[str, Any]]) -> List[Expense]:
+        """
+        Add several expenses to the tracker at once.
+        
+        Every expense is validated before any is added, so an invalid entry
+        leaves the tracker unchanged. The indexes are sorted once for the
+        whole batch instead of once per expense.
+        
+        Args:
+            expenses: Mappings with the add_expense arguments ("amount",
+                "category", "date" and optionally "description")
+            
+        Returns:
+            The newly created Expense objects, in input order
+            
+        Raises:
+            ValueError: If any entry is missing its amount or date, or any
+                amount is invalid or category is missing
+            TypeError: If any date cannot be ordered against the other
+                expense dates
+        """
+        new_expenses = []
+        by_category: Dict[str, List[Expense]] = defaultdict(list)
+        for entry in expenses:
+            try:
+                amount, date = entry["amount"], entry["date"]
+            except KeyError as e:
+                raise ValueError(f"Missing required field: {e.args[0]}") from None
+            category = entry.get("category")
+            amount, amount_cents = _validate_expense(amount, category)
+            expense = Expense(amount, category, date,
+                              entry.get("description", ""),
+                              amount_cents=amount_cents)
+            new_expenses.append(expense)
+            by_category[category].append(expense)
+        
+        if not new_expenses:
+            return new_expenses
+        
+        # Index by date first: it is the only step that compares values
+        self._by_date.extend(new_expenses)
+        for category, group in by_category.items():
+            self._by_category[category].extend(group)
+        for expense in new_expenses:
+            self._expenses[expense.id] = expense
+            self._adjust_totals(expense, 1)
+        self._summary_cache.clear()
+        return new_expenses
+    
+    @_locked
     def update_expense(self, expense_id: str, amount: Decimal = None, 
                       category: str = None, date: datetime = None, 
                       description: str = None) -> Optional[Expense]:
@@ -109,35 +464,52 @@ class BudgetTracker:
             
         Raises:
             ValueError: If amount is invalid or category is empty
+            TypeError: If the new date cannot be ordered against the other
+                expense dates
         """
-        for expense in self._expenses:
-            if expense.id == expense_id:
-                # Validate amount if provided
-                if amount is not None:
-                    try:
-                        if not isinstance(amount, Decimal):
-                            amount = Decimal(str(amount))
-                        expense.amount = amount
-                    except (InvalidOperation, ValueError):
-                        raise ValueError("Please enter a valid amount")
-                
-                # Validate category if provided
-                if category is not None:
-                    if not category:
-                        raise ValueError("Please select a category")
-                    expense.category = category
-                
-                # Update other fields if provided
-                if date is not None:
-                    expense.date = date
-                
-                if description is not None:
-                    expense.description = description
-                
-                return expense
-        
-        return None
+        expense = self._expenses.get(expense_id)
+        if expense is None:
+            return None
+        
+        # Validate every new value before changing anything, so a rejected
+        # edit leaves the expense and its indexes as they were
+        if amount is not None:
+            amount, amount_cents = _parse_amount(amount)
+        if category is not None and not category:
+            raise ValueError("Please select a category")
+        if date is not None:
+            self._by_date.check_date(date)
+        
+        # The indexes hold copies of date, amount and category,
+        # so take the expense out while it changes
+        self._by_date.remove(expense)
+        self._adjust_totals(expense, -1)
+        self._unindex_category(expense)
+        self._summary_cache.clear()
+        
+        if amount is not None:
+            expense.amount = amount
+            expense.amount_cents = amount_cents
+        
+        if category is not None:
+            expense.category = category
+        
+        # Update other fields if provided
+        if date is not None:
+            expense.date = date
+        
+        if description is not None:
+            expense.description = description
+        
+        # Drop values derived from the old fields
+        expense.invalidate()
+        self._by_date.insert(expense)
+        self._by_category[expense.category].insert(expense)
+        self._adjust_totals(expense, 1)
+        
+        return expense
     
+    @_locked
     def delete_expense(self, expense_id: str) -> bool:
         """
         Delete an expense by ID.
@@ -148,36 +520,60 @@ class BudgetTracker:
         Returns:
             True if the expense was deleted, False if not found
         """
-        for i, expense in enumerate(self._expenses):
-            if expense.id == expense_id:
-                del self._expenses[i]
-                return True
-        return False
+        expense = self._expenses.pop(expense_id, None)
+        if expense is None:
+            return False
+        
+        self._adjust_totals(expense, -1)
+        self._unindex_category(expense)
+        self._by_date.remove(expense)
+        self._summary_cache.clear()
+        return True
+    
+    def _unindex_category(self, expense: Expense):
+        """
+        Remove an expense from its category bucket, dropping the bucket and
+        its running total once the category has no expenses left.
+        """
+        bucket = self._by_category[expense.category]
+        bucket.remove(expense)
+        if not bucket:
+            del self._by_category[expense.category]
+            del self._category_totals[expense.category]
+    
+    def _adjust_totals(self, expense: Expense, sign: int):
+        """Add (sign=1) or subtract (sign=-1) an expense from the running totals."""
+        cents = sign * expense.amount_cents
+        self._category_totals[expense.category] = (
+            self._category_totals.get(expense.category, 0) + cents)
+        self._total_cents += cents
     
+    @_locked
     def get_expenses(self, start_date: datetime = None, 
-                    end_date: datetime = None) -> List[Expense]:
+                    end_date: datetime = None,
+                    category: str = None) -> List[Expense]:
         """
-        Get all expenses, optionally filtered by date range.
+        Get all expenses, optionally filtered by date range and category.
+        
+        Results come from binary searching the overall or per-category date
+        index, and are always returned in date order; expenses sharing a
+        date keep the order they were added in.
         
         Args:
             start_date: Optional start date for filtering
             end_date: Optional end date for filtering
+            category: Optional category for filtering
             
         Returns:
             List of Expense objects
         """
-        if start_date is None and end_date is None:
-            return self._expenses.copy()
+        if category is None:
+            return self._by_date.range(start_date, end_date)
         
-        filtered_expenses = []
-        for expense in self._expenses:
-            if start_date and expense.date < start_date:
-                continue
-            if end_date and expense.date > end_date:
-                continue
-            filtered_expenses.append(expense)
-        
-        return filtered_expenses
+        bucket = self._by_category.get(category)
+        if bucket is None:
+            return []
+        return bucket.range(start_date, end_date)
     
     def get_expenses_by_category(self, category: str) -> List[Expense]:
         """
@@ -187,9 +583,9 @@ class BudgetTracker:
             category: The category to filter by
             
         Returns:
-            List of Expense objects in the specified category
+            List of Expense objects in the specified category, in date order
         """
-        return [expense for expense in self._expenses if expense.category == category]
+        return self.get_expenses(category=category)
     
     def get_category_summary(self, start_date: datetime = None, 
                            end_date: datetime = None) -> Dict[str, Decimal]:
@@ -203,15 +599,8 @@ class BudgetTracker:
         Returns:
             Dictionary mapping category names to total amounts
         """
-        expenses = self.get_expenses(start_date, end_date)
-        summary = {}
-        
-        for expense in expenses:
-            if expense.category not in summary:
-                summary[expense.category] = Decimal('0')
-            summary[expense.category] += expense.amount
-        
-        return summary
+        summary, _ = self._summarize(start_date, end_date)
+        return dict(summary)
     
     def get_total_expenses(self, start_date: datetime = None, 
                          end_date: datetime = None) -> Decimal:
@@ -225,16 +614,72 @@ class BudgetTracker:
         Returns:
             Total amount as a Decimal
         """
-        expenses = self.get_expenses(start_date, end_date)
-        return sum(expense.amount for expense in expenses)
+        _, total = self._summarize(start_date, end_date)
+        return total
+    
+    def get_summary(self, start_date: datetime = None, 
+                    end_date: datetime = None) -> Tuple[Dict[str, Decimal], Decimal]:
+        """
+        Get the category summary and total, optionally filtered by date range.
+        
+        Both come from the same pass over the expenses, so the category
+        amounts always add up to the total even while other threads write.
+        
+        Args:
+            start_date: Optional start date for filtering
+            end_date: Optional end date for filtering
+            
+        Returns:
+            Tuple of (dictionary mapping category names to total amounts,
+            total amount as a Decimal)
+        """
+        summary, total = self._summarize(start_date, end_date)
+        return dict(summary), total
     
-    def export_summary(self, format: str = "CSV", filename: str = "expense_summary.csv"):
+    @_locked
+    def _summarize(self, start_date: datetime = None, 
+                   end_date: datetime = None) -> Tuple[Dict[str, Decimal], Decimal]:
+        """
+        Compute the category summary and total for a date range in one pass.
+        
+        Results are cached per date range until the next write, so repeated
+        dashboard queries for the same range are dictionary lookups. Holding
+        the tracker lock throughout means a write cannot clear the cache
+        between computing a result and caching it.
+        
+        Args:
+            start_date: Optional start date for filtering
+            end_date: Optional end date for filtering
+            
+        Returns:
+            Tuple of (category summary, total amount)
+        """
+        key = (start_date, end_date)
+        cached = self._summary_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Totals are integer cents, converted to Decimal only once. Without a
+        # date filter the running totals answer directly.
+        if start_date is None and end_date is None:
+            summary_cents, total_cents = self._category_totals, self._total_cents
+        else:
+            summary_cents, total_cents = self._by_date.totals(start_date, end_date)
+        summary = {category: _from_cents(cents) for category, cents in summary_cents.items()}
+        total = _from_cents(total_cents)
+        if len(self._summary_cache) >= _SUMMARY_CACHE_SIZE:
+            self._summary_cache.clear()
+        self._summary_cache[key] = (summary, total)
+        return summary, total
+    
+    def export_summary(self, format: str = "CSV",
+                       filename: Union[str, os.PathLike] = "expense_summary.csv"):
         """
         Export the expense summary to a file.
         
         Args:
             format: The export format (currently only "CSV" is supported)
-            filename: The name of the file to export to
+            filename: The name or path of the file to export to
             
         Raises:
             ValueError: If the format is not supported
@@ -244,25 +689,70 @@ class BudgetTracker:
         
         self.export_to_csv(filename)
     
-    def export_to_csv(self, filename: str):
+    def export_to_csv(self, filename: Union[str, os.PathLike, TextIO]):
         """
         Export the expense data to a CSV file.
         
+        Filenames ending in ".gz" are written gzip-compressed.
+        
         Args:
-            filename: The name of the file to export to
+            filename: The name or path of the file to export to, or an open
+                text file object to write to directly
+        """
+        # Snapshot the expenses so writes made during the export cannot
+        # change them while they are written
+        expenses = self.get_expenses()
+        if not isinstance(filename, (str, os.PathLike)):
+            self._write_csv(filename, expenses)
+            return
+        
+        with _open_export(filename) as csvfile:
+            self._write_csv(csvfile, expenses)
+    
+    def export_to_csv_stream(self, chunk_rows: int = _EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
         """
-        with open(filename, 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
+        Generate the CSV export as UTF-8 chunks, for streaming responses.
+        
+        Only one chunk of formatted rows is held in memory at a time. Rows are
+        encoded as they are written, so chunks are yielded as bytes that the
+        server can send without another encoding pass. The expenses are
+        snapshotted when the export starts, so writes made while it is being
+        consumed do not affect it.
+        
+        Args:
+            chunk_rows: Number of expense rows per chunk
             
-            # Write header
+        Yields:
+            UTF-8 encoded CSV, starting with the header row
+        """
+        expenses = self.get_expenses()
+        raw = io.BytesIO()
+        text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        self._write_csv(text, ())
+        for start in range(0, len(expenses), chunk_rows):
+            self._write_csv(text, expenses[start:start + chunk_rows], header=False)
+            text.flush()
+            yield raw.getvalue()
+            raw.seek(0)
+            raw.truncate()
+        text.flush()
+        if raw.tell():
+            yield raw.getvalue()
+    
+    def _write_csv(self, csvfile: TextIO, expenses: Iterable[Expense], header: bool = True):
+        """Write expenses as CSV rows, optionally preceded by the header row."""
+        # Only exports need the csv module, so it is not loaded at import time
+        import csv
+        
+        writer = csv.writer(csvfile)
+        
+        # Write header
+        if header:
             writer.writerow(['ID', 'Amount', 'Category', 'Date', 'Description'])
-            
-            # Write expense data
-            for expense in self._expenses:
-                writer.writerow([
-                    expense.id,
-                    str(expense.amount),
-                    expense.category,
-                    expense.date.strftime('%Y-%m-%d'),
-                    expense.description
-                ])
+        
+        # Write expense data in a single call
+        writer.writerows(
+            (expense.id, format(expense.amount, 'f'), expense.category,
+             expense.date.strftime('%Y-%m-%d'), expense.description)
+            for expense in expenses
+        )
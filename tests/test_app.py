@@ -0,0 +1,283 @@
+import gzip
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+import msgpack
+import orjson
+from flask import jsonify
+
+# Import the modules to be tested
+from src import app as app_module
+
+
+class TestAPIEndpoints(unittest.TestCase):
+    """
+    Test cases for the REST API response handling.
+    """
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create one test client for every test in the class."""
+        app_module.app.config["TESTING"] = True
+        cls.client = app_module.app.test_client()
+    
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        # Give each test its own empty tracker behind the API
+        patcher = patch.object(app_module, "budget_tracker", app_module.BudgetTracker())
+        self.budget_tracker = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def add_sample_expenses(self, count):
+        """Add a number of sample expenses through the tracker."""
+        for i in range(count):
+            self.budget_tracker.add_expense(
+                amount=Decimal("12.50"),
+                category="Groceries",
+                date=datetime(2025, 4, 1 + i % 28),
+                description=f"Groceries {i}"
+            )
+    
+    def test_list_expenses_after_update(self):
+        """
+        Test that the expense list shows an expense's latest details.
+        
+        Scenario: List an expense after editing it
+            Given I have listed my expenses
+            When I change an expense's amount to "99.00"
+            Then the expense list should show amount "99.00"
+        """
+        self.add_sample_expenses(1)
+        expense_id = orjson.loads(self.client.get("/expense").data)["expenses"][0]["id"]
+        
+        # Execute the action: update the listed expense
+        response = self.client.put(f"/expense/{expense_id}", json={"amount": "99.00"})
+        
+        # Verify both the response and the next listing show the new amount
+        self.assertEqual(orjson.loads(response.data)["expense"]["amount"], "99.00")
+        listed = orjson.loads(self.client.get("/expense").data)["expenses"]
+        self.assertEqual(listed[0]["amount"], "99.00")
+    
+    def test_add_expense_with_utc_offset(self):
+        """
+        Test adding an expense dated with a UTC offset.
+        
+        Scenario: Add an expense with a timezone-aware date
+            Given I have an expense dated "2025-04-01"
+            When I add an expense dated "2025-04-02T10:00:00+02:00"
+            Then the expense should be added
+            And its date should be stored as "2025-04-02T08:00:00" UTC
+            And filtering by date should include both expenses
+        """
+        self.add_sample_expenses(1)
+        
+        # Execute the action: add an expense with an offset date
+        response = self.client.post("/expense", json={
+            "amount": "10.00",
+            "category": "Dining",
+            "date": "2025-04-02T10:00:00+02:00"
+        })
+        
+        # Verify it was added with the date converted to naive UTC
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(orjson.loads(response.data)["expense"]["date"], "2025-04-02T08:00:00")
+        response = self.client.get("/balance?start_date=2025-04-01T00:00:00Z&end_date=2025-04-02T23:59:59")
+        self.assertEqual(orjson.loads(response.data)["balance"], "22.50")
+    
+    def test_add_expense_with_missing_fields(self):
+        """
+        Test adding an expense without its required fields.
+        
+        Scenario: Add an expense with missing fields
+            Given I am on the expense entry page
+            When I add an expense with only an amount
+            Then I should see an error message for the first missing field "category"
+        """
+        # Execute the action: add an expense without category or date
+        response = self.client.post("/expense", json={"amount": "10.00"})
+        
+        # Verify the first missing field in declared order is reported
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(orjson.loads(response.data),
+                         {"error": "Missing required field: category"})
+        self.assertEqual(self.budget_tracker.get_expenses(), [])
+    
+    def test_add_expense_with_invalid_body(self):
+        """
+        Test adding an expense with a malformed or empty request body.
+        
+        Scenario Outline: Add an expense with an unusable body
+            Given I am on the expense entry page
+            When I submit the body <body>
+            Then I should see the error message <error>
+        
+            Examples:
+                | body        | error              |
+                | "{amount:"  | "Invalid JSON"     |
+                | ""          | "No data provided" |
+        """
+        for body, error in ((b"{amount:", "Invalid JSON"), (b"", "No data provided")):
+            with self.subTest(body=body):
+                # Execute the action: post the body
+                response = self.client.post("/expense", data=body,
+                                            content_type="application/json")
+        
+                # Verify the request is rejected with the error
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(orjson.loads(response.data), {"error": error})
+    
+    def test_index_page_not_modified(self):
+        """
+        Test conditional requests for the index page.
+        
+        Scenario: Reload the application page
+            Given I have loaded the application page
+            When I reload it with the ETag I received
+            Then I should get "304 Not Modified" with no body
+        """
+        # Execute the action: load the page and reload it with its ETag
+        response = self.client.get("/")
+        etag = response.headers["ETag"]
+        reloaded = self.client.get("/", headers={"If-None-Match": etag})
+        
+        # Verify the first load is cacheable and the reload is not modified
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("max-age=3600", response.headers["Cache-Control"])
+        self.assertEqual(reloaded.status_code, 304)
+        self.assertEqual(reloaded.data, b"")
+    
+    def test_large_responses_are_gzip_compressed(self):
+        """
+        Test that larger responses are compressed for clients accepting gzip.
+        
+        Scenario: Fetch a long expense list
+            Given I have enough expenses for the response to exceed the compression threshold
+            When I request "/expense" accepting gzip
+            Then the response should be gzip-encoded and vary on Accept-Encoding
+            But a small response should be sent uncompressed
+        """
+        self.add_sample_expenses(20)
+        
+        # Execute the action: fetch the expense list accepting gzip
+        response = self.client.get("/expense", headers={"Accept-Encoding": "gzip"})
+        
+        # Verify the body was compressed and decompresses to the expense list
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        body = gzip.decompress(response.data)
+        self.assertGreaterEqual(len(body), app_module._COMPRESS_MIN_SIZE)
+        self.assertEqual(len(orjson.loads(body)["expenses"]), 20)
+        
+        # Verify a small response is not compressed
+        response = self.client.get("/balance", headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(orjson.loads(response.data)["balance"], "250.00")
+    
+    def test_msgpack_only_when_preferred(self):
+        """
+        Test content negotiation between JSON and MessagePack.
+        
+        Scenario: Request a MessagePack response
+            Given I have expenses in my expense list
+            When I request "/balance" ranking "application/msgpack" above JSON
+            Then I should receive a MessagePack response
+            But when JSON is ranked higher or any type is accepted
+            Then I should receive JSON
+        """
+        self.add_sample_expenses(1)
+        
+        # Execute the action and verify msgpack is sent when ranked first
+        response = self.client.get("/balance", headers={"Accept": "application/msgpack"})
+        self.assertEqual(response.mimetype, "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.data)["balance"], "12.50")
+        self.assertIn("Accept", response.headers["Vary"])
+        
+        # Verify JSON is sent otherwise
+        for accept in ("application/json, application/msgpack;q=0.5", "*/*", ""):
+            with self.subTest(accept=accept):
+                response = self.client.get("/balance", headers={"Accept": accept})
+                self.assertEqual(response.mimetype, "application/json")
+                self.assertEqual(orjson.loads(response.data)["balance"], "12.50")
+    
+    def test_empty_results(self):
+        """
+        Test the expense list and summary of an empty expense list.
+        
+        Scenario: Open the dashboard with no expenses
+            Given I have no expenses
+            When I request "/expense" and "/summary" as JSON or MessagePack
+            Then I should receive an empty expense list and a zero summary
+            And a date-filtered summary should echo its filters
+        """
+        for mimetype, decode in (("application/json", orjson.loads),
+                                 ("application/msgpack", msgpack.unpackb)):
+            with self.subTest(mimetype=mimetype):
+                headers = {"Accept": mimetype}
+        
+                # Execute the action: fetch the empty results
+                expenses = self.client.get("/expense", headers=headers)
+                summary = self.client.get("/summary", headers=headers)
+                filtered = self.client.get("/summary?start_date=2025-04-01", headers=headers)
+        
+                # Verify the empty bodies in the negotiated media type
+                self.assertEqual(expenses.mimetype, mimetype)
+                self.assertEqual(decode(expenses.data), {"expenses": []})
+                self.assertEqual(summary.mimetype, mimetype)
+                self.assertEqual(decode(summary.data), {
+                    "summary": {},
+                    "total": "0.00",
+                    "filters": {"start_date": None, "end_date": None}
+                })
+                self.assertEqual(decode(filtered.data)["filters"],
+                                 {"start_date": "2025-04-01T00:00:00", "end_date": None})
+    
+    def test_export_expenses_as_csv(self):
+        """
+        Test downloading all expenses as CSV.
+        
+        Scenario: Download the expense export
+            Given I have expenses in my expense list
+            When I request "/export"
+            Then I should receive a CSV attachment
+            And it should contain the header and a row for each expense
+        """
+        self.add_sample_expenses(3)
+        
+        # Execute the action: download the export
+        response = self.client.get("/export")
+        
+        # Verify the headers and the streamed body
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "text/csv")
+        self.assertEqual(response.headers["Content-Disposition"],
+                         "attachment; filename=expense_summary.csv")
+        lines = response.data.decode("utf-8").splitlines()
+        self.assertEqual(lines[0], "ID,Amount,Category,Date,Description")
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[1].endswith(",12.50,Groceries,2025-04-01,Groceries 0"))
+    
+    def test_jsonify_uses_orjson_provider(self):
+        """
+        Test that Flask's own JSON helpers encode like the API.
+        
+        Scenario: Encode a payload with jsonify
+            Given a payload with a Decimal amount, a datetime and unsorted keys
+            When it is encoded with jsonify
+            Then the amount should be a plain string and the date ISO formatted
+            And the keys should be sorted, including non-string keys
+        """
+        with app_module.app.app_context():
+            # Execute the action: encode the payloads
+            response = jsonify({"date": datetime(2025, 4, 1), "amount": Decimal("12.50")})
+            encoded = app_module.app.json.dumps({2: "b", 1: "a"})
+        
+        # Verify the encodings
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertEqual(response.data, b'{"amount":"12.50","date":"2025-04-01T00:00:00"}')
+        self.assertEqual(encoded, '{"1":"a","2":"b"}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,44 @@
+import copy
+import csv
+import gzip
+import io
+import os
+import tempfile
+import threading
 import unittest
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
-from unittest.mock import MagicMock, patch
+from pathlib import Path
+from unittest.mock import MagicMock
 
 # Import the modules to be tested
 from src.budget_tracker import BudgetTracker, Expense
 
+# Expense dates shared across scenarios
+APRIL_1 = datetime(2025, 4, 1)
+APRIL_2 = datetime(2025, 4, 2)
+APRIL_3 = datetime(2025, 4, 3)
+
+# Sample expenses seeded for the summary scenarios
+SAMPLE_EXPENSES = (
+    {"amount": Decimal("45.99"), "category": "Groceries",
+     "date": APRIL_1, "description": "Weekly groceries"},
+    {"amount": Decimal("12.50"), "category": "Transportation",
+     "date": APRIL_1, "description": "Bus fare"},
+    {"amount": Decimal("30.00"), "category": "Dining",
+     "date": APRIL_2, "description": "Lunch with team"},
+    {"amount": Decimal("25.75"), "category": "Groceries",
+     "date": APRIL_2, "description": "Fruits and snacks"},
+)
+
+# Summary of the sample expenses
+EXPECTED_CATEGORY_SUMMARY = {
+    "Groceries": Decimal("71.74"),
+    "Transportation": Decimal("12.50"),
+    "Dining": Decimal("30.00")
+}
+EXPECTED_TOTAL = Decimal("114.24")
+
 
 class TestExpenseTracking(unittest.TestCase):
     """
@@ -35,7 +68,7 @@ class TestExpenseTracking(unittest.TestCase):
         expense = self.budget_tracker.add_expense(
             amount=Decimal("45.99"),
             category="Groceries",
-            date=datetime(2025, 4, 2),
+            date=APRIL_2,
             description="Weekly grocery shopping"
         )
         
@@ -46,65 +79,116 @@ class TestExpenseTracking(unittest.TestCase):
         # Verify the expense details match the input
         self.assertEqual(expense.amount, Decimal("45.99"))
         self.assertEqual(expense.category, "Groceries")
-        self.assertEqual(expense.date, datetime(2025, 4, 2))
+        self.assertEqual(expense.date, APRIL_2)
         self.assertEqual(expense.description, "Weekly grocery shopping")
     
-    def test_add_expense_with_invalid_amount(self):
+    def test_add_expense_with_invalid_input(self):
         """
-        Test adding an expense with an invalid amount.
+        Test adding an expense with an invalid amount or without a category.
         
-        Scenario: Add an expense with invalid amount
+        Scenario Outline: Add an expense with invalid input
             Given I am on the expense entry page
-            When I enter the expense amount "abc"
-            And I select the category "Groceries"
+            When I enter the expense amount "<amount>"
+            And I select the category "<category>"
             And I enter the date "2025-04-02"
             And I click the "Add Expense" button
-            Then I should see an error message "Please enter a valid amount"
+            Then I should see an error message "<error>"
             And the expense should not be added to my expense list
-        """
-        # Execute the action and verify it raises the expected exception
-        with self.assertRaises(ValueError) as context:
-            self.budget_tracker.add_expense(
-                amount="abc",  # Invalid amount
-                category="Groceries",
-                date=datetime(2025, 4, 2),
-                description=""
-            )
         
-        # Verify the error message
-        self.assertEqual(str(context.exception), "Please enter a valid amount")
+            Examples:
+              | amount       | category  | error                       |
+              | abc          | Groceries | Please enter a valid amount |
+              | 12.345       | Groceries | Please enter a valid amount |
+              | NaN          | Groceries | Please enter a valid amount |
+              | Infinity     | Groceries | Please enter a valid amount |
+              | 1E+999999999 | Groceries | Please enter a valid amount |
+              | 25.00        |           | Please select a category    |
+        """
+        examples = [
+            ("abc", "Groceries", "Please enter a valid amount"),
+            # Amounts that cannot be stored as whole cents
+            ("12.345", "Groceries", "Please enter a valid amount"),
+            ("NaN", "Groceries", "Please enter a valid amount"),
+            ("Infinity", "Groceries", "Please enter a valid amount"),
+            ("1E+999999999", "Groceries", "Please enter a valid amount"),
+            # Missing category
+            (Decimal("25.00"), None, "Please select a category"),
+        ]
+        for amount, category, error in examples:
+            with self.subTest(amount=amount, category=category):
+                # Execute the action and verify it raises the expected exception
+                with self.assertRaises(ValueError) as context:
+                    self.budget_tracker.add_expense(
+                        amount=amount,
+                        category=category,
+                        date=APRIL_2,
+                        description=""
+                    )
+                
+                # Verify the error message
+                self.assertEqual(str(context.exception), error)
         
         # Verify no expense was added
         expenses = self.budget_tracker.get_expenses()
         self.assertEqual(len(expenses), 0)
     
-    def test_add_expense_without_category(self):
+    def test_add_expenses_in_bulk(self):
         """
-        Test adding an expense without selecting a category.
+        Test adding several expenses at once.
         
-        Scenario: Add an expense without selecting a category
+        Scenario: Import a batch of expenses
             Given I am on the expense entry page
-            When I enter the expense amount "25.00"
-            And I enter the date "2025-04-02"
-            And I click the "Add Expense" button
+            When I import expenses dated "2025-04-02" and "2025-04-01"
+            Then I should see both expenses in my expense list ordered by date
+            But when one imported expense has no category
             Then I should see an error message "Please select a category"
-            And the expense should not be added to my expense list
+            And none of that batch should be added to my expense list
+            And the same should happen for a missing date or a date that cannot be ordered
         """
-        # Execute the action and verify it raises the expected exception
-        with self.assertRaises(ValueError) as context:
-            self.budget_tracker.add_expense(
-                amount=Decimal("25.00"),
-                category=None,  # Missing category
-                date=datetime(2025, 4, 2),
-                description=""
-            )
+        # Execute the action: add a batch of expenses
+        expenses = self.budget_tracker.add_expenses([
+            {"amount": Decimal("45.99"), "category": "Groceries",
+             "date": APRIL_2, "description": "Weekly grocery shopping"},
+            {"amount": "12.50", "category": "Transportation",
+             "date": APRIL_1},
+        ])
+        
+        # Verify both expenses were added and are listed in date order
+        self.assertEqual([expense.description for expense in expenses],
+                         ["Weekly grocery shopping", ""])
+        self.assertEqual(
+            self.budget_tracker.get_expenses(start_date=APRIL_1),
+            [expenses[1], expenses[0]]
+        )
+        self.assertEqual(self.budget_tracker.get_total_expenses(), Decimal("58.49"))
         
-        # Verify the error message
+        # Execute the action with an invalid entry and verify nothing is added
+        with self.assertRaises(ValueError) as context:
+            self.budget_tracker.add_expenses([
+                {"amount": "5.00", "category": "Dining", "date": APRIL_3},
+                {"amount": "7.00", "category": "", "date": APRIL_3},
+            ])
         self.assertEqual(str(context.exception), "Please select a category")
+        self.assertEqual(len(self.budget_tracker.get_expenses()), 2)
         
-        # Verify no expense was added
-        expenses = self.budget_tracker.get_expenses()
-        self.assertEqual(len(expenses), 0)
+        # Execute the action with a missing date and verify nothing is added
+        with self.assertRaises(ValueError) as context:
+            self.budget_tracker.add_expenses([
+                {"amount": "5.00", "category": "Dining", "date": APRIL_3},
+                {"amount": "7.00", "category": "Dining"},
+            ])
+        self.assertEqual(str(context.exception), "Missing required field: date")
+        self.assertEqual(len(self.budget_tracker.get_expenses()), 2)
+        
+        # Execute the action with a timezone-aware date and verify nothing is added
+        with self.assertRaises(TypeError):
+            self.budget_tracker.add_expenses([
+                {"amount": "5.00", "category": "Dining", "date": APRIL_3},
+                {"amount": "7.00", "category": "Dining",
+                 "date": datetime(2025, 4, 3, tzinfo=timezone.utc)},
+            ])
+        self.assertEqual(len(self.budget_tracker.get_expenses(start_date=APRIL_1)), 2)
+        self.assertEqual(self.budget_tracker.get_total_expenses(), Decimal("58.49"))
     
     def test_edit_existing_expense(self):
         """
@@ -123,7 +207,7 @@ class TestExpenseTracking(unittest.TestCase):
         original_expense = self.budget_tracker.add_expense(
             amount=Decimal("30.50"),
             category="Dining",
-            date=datetime(2025, 4, 2),
+            date=APRIL_2,
             description="Lunch"
         )
         
@@ -144,6 +228,71 @@ class TestExpenseTracking(unittest.TestCase):
         self.assertEqual(updated_expense.amount, Decimal("35.75"))
         self.assertEqual(updated_expense.category, "Entertainment")
     
+    def test_edit_expense_while_it_is_serialized(self):
+        """
+        Test that editing an expense while it is being serialized is not lost.
+        
+        Scenario: Edit an expense while another request lists it
+            Given I have an expense with amount "30.50"
+            When I change the amount to "35.75" while the expense is being serialized
+            Then that serialization may show the old amount
+            But later serializations should show amount "35.75"
+        """
+        expense = self.budget_tracker.add_expense(
+            amount=Decimal("30.50"),
+            category="Dining",
+            date=APRIL_2,
+            description="Lunch"
+        )
+        
+        def read_then_update(expense):
+            # The old amount has been read when the update lands
+            amount = expense.amount
+            self.budget_tracker.update_expense(expense.id, amount=Decimal("35.75"))
+            return amount
+        
+        # Execute the action: update the expense in the middle of a build
+        self.assertEqual(expense.cached("amount", read_then_update), Decimal("30.50"))
+        
+        # Verify the stale value was not kept
+        self.assertEqual(expense.cached("amount", lambda e: e.amount), Decimal("35.75"))
+    
+    def test_failed_edit_leaves_expenses_unchanged(self):
+        """
+        Test that an edit with an incomparable date changes nothing.
+        
+        Scenario: Edit an expense with a timezone-aware date
+            Given I have expenses with naive dates
+            When I change one expense's date to a timezone-aware date
+            Then the edit should be rejected
+            And the expense list and totals should be unchanged
+            And the expense can still be deleted
+        """
+        expense = self.budget_tracker.add_expense(
+            amount=Decimal("30.50"),
+            category="Dining",
+            date=APRIL_2,
+            description="Lunch"
+        )
+        self.budget_tracker.add_expense(Decimal("10.00"), "Dining", APRIL_1)
+        
+        # Execute the action: move the expense to an aware date
+        with self.assertRaises(TypeError):
+            self.budget_tracker.update_expense(
+                expense.id,
+                amount=Decimal("99.00"),
+                category="Entertainment",
+                date=datetime(2025, 4, 3, tzinfo=timezone.utc)
+            )
+        
+        # Verify the expense and every index are unchanged
+        self.assertEqual(expense.amount, Decimal("30.50"))
+        self.assertEqual(expense.date, APRIL_2)
+        self.assertEqual(len(self.budget_tracker.get_expenses(start_date=APRIL_1)), 2)
+        self.assertEqual(self.budget_tracker.get_category_summary(), {"Dining": Decimal("40.50")})
+        self.assertTrue(self.budget_tracker.delete_expense(expense.id))
+        self.assertEqual(self.budget_tracker.get_total_expenses(), Decimal("10.00"))
+    
     def test_delete_expense(self):
         """
         Test deleting an expense.
@@ -159,7 +308,7 @@ class TestExpenseTracking(unittest.TestCase):
         expense = self.budget_tracker.add_expense(
             amount=Decimal("45.99"),
             category="Groceries",
-            date=datetime(2025, 4, 2),
+            date=APRIL_2,
             description="Weekly grocery shopping"
         )
         
@@ -172,6 +321,95 @@ class TestExpenseTracking(unittest.TestCase):
         # Verify the expense was removed from the list
         expenses = self.budget_tracker.get_expenses()
         self.assertNotIn(expense, expenses)
+    
+    def test_edit_expense_category_moves_expense_between_categories(self):
+        """
+        Test that changing or deleting an expense updates the category breakdown.
+        
+        Scenario: Move an expense to another category
+            Given I have an expense in category "Dining"
+            When I change the category to "Entertainment"
+            Then the expense should only be listed under "Entertainment"
+            And deleting it should remove it from the "Entertainment" breakdown
+        """
+        # Create an expense in the original category
+        expense = self.budget_tracker.add_expense(
+            amount=Decimal("30.50"),
+            category="Dining",
+            date=APRIL_2,
+            description="Lunch"
+        )
+        
+        # Execute the action: move the expense to another category
+        self.budget_tracker.update_expense(expense.id, category="Entertainment")
+        
+        # Verify the expense is only listed under the new category
+        self.assertEqual(self.budget_tracker.get_expenses_by_category("Dining"), [])
+        self.assertEqual(
+            self.budget_tracker.get_expenses_by_category("Entertainment"), [expense]
+        )
+        
+        # Verify deleting the expense removes it from the breakdown
+        self.budget_tracker.delete_expense(expense.id)
+        self.assertEqual(self.budget_tracker.get_expenses_by_category("Entertainment"), [])
+    
+    def test_expenses_listed_in_date_order(self):
+        """
+        Test that every expense listing is in date order.
+        
+        Scenario: List expenses entered out of date order
+            Given I add expenses dated "2025-04-02", "2025-04-01", "2025-04-01" and "2025-04-02"
+            When I view my expense list, with or without a category filter
+            Then the expenses should be listed by date
+            And expenses on the same date should keep the order I added them in
+        """
+        for description, category, day in (("Dinner", "Dining", 2),
+                                           ("Breakfast", "Dining", 1),
+                                           ("Groceries", "Groceries", 1),
+                                           ("Lunch", "Dining", 2)):
+            self.budget_tracker.add_expense(
+                Decimal("10.00"), category, datetime(2025, 4, day), description)
+        
+        # Execute the action: list all expenses and one category
+        expenses = self.budget_tracker.get_expenses()
+        dining = self.budget_tracker.get_expenses(category="Dining")
+        
+        # Verify both listings are in date order
+        self.assertEqual([expense.description for expense in expenses],
+                         ["Breakfast", "Groceries", "Dinner", "Lunch"])
+        self.assertEqual([expense.description for expense in dining],
+                         ["Breakfast", "Dinner", "Lunch"])
+    
+    def test_concurrent_writes_keep_expenses_consistent(self):
+        """
+        Test that writes from several threads leave the tracker consistent.
+        
+        Scenario: Record expenses from concurrent requests
+            Given several requests add, edit and delete expenses at the same time
+            When they have all finished
+            Then the expense list, date filter and totals should agree
+        """
+        def record():
+            for i in range(200):
+                expense = self.budget_tracker.add_expense(
+                    Decimal("1.00"), f"Category {i % 3}", datetime(2025, 4, 1 + i % 28))
+                self.budget_tracker.update_expense(expense.id, date=datetime(2025, 5, 1 + i % 28))
+                if i % 2:
+                    self.budget_tracker.delete_expense(expense.id)
+                self.budget_tracker.get_total_expenses(start_date=APRIL_1)
+        
+        # Execute the action: write from several threads at once
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Verify every view of the expenses agrees
+        self.assertEqual(len(self.budget_tracker.get_expenses()), 400)
+        self.assertEqual(len(self.budget_tracker.get_expenses(start_date=APRIL_1)), 400)
+        self.assertEqual(self.budget_tracker.get_total_expenses(), Decimal("400.00"))
+        self.assertEqual(self.budget_tracker.get_total_expenses(start_date=APRIL_1), Decimal("400.00"))
 
 
 class TestExpenseSummaryByCategory(unittest.TestCase):
@@ -179,36 +417,18 @@ class TestExpenseSummaryByCategory(unittest.TestCase):
     Test cases for the Expense Summary by Category feature based on BDD scenarios.
     """
     
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        # Initialize the BudgetTracker instance for testing
-        self.budget_tracker = BudgetTracker()
+    @classmethod
+    def setUpClass(cls):
+        """Set up the sample expenses once for all test methods."""
+        # Initialize the BudgetTracker instance shared by the class
+        cls.seeded_tracker = BudgetTracker()
         
-        # Create sample expenses for testing
-        self.budget_tracker.add_expense(
-            amount=Decimal("45.99"),
-            category="Groceries",
-            date=datetime(2025, 4, 1),
-            description="Weekly groceries"
-        )
-        self.budget_tracker.add_expense(
-            amount=Decimal("12.50"),
-            category="Transportation",
-            date=datetime(2025, 4, 1),
-            description="Bus fare"
-        )
-        self.budget_tracker.add_expense(
-            amount=Decimal("30.00"),
-            category="Dining",
-            date=datetime(2025, 4, 2),
-            description="Lunch with team"
-        )
-        self.budget_tracker.add_expense(
-            amount=Decimal("25.75"),
-            category="Groceries",
-            date=datetime(2025, 4, 2),
-            description="Fruits and snacks"
-        )
+        # Create sample expenses for testing in one batch
+        cls.seeded_tracker.add_expenses(SAMPLE_EXPENSES)
+    
+    def setUp(self):
+        """Give each test its own copy of the seeded tracker to change."""
+        self.budget_tracker = copy.deepcopy(self.seeded_tracker)
     
     def test_view_expense_summary_by_category(self):
         """
@@ -233,16 +453,14 @@ class TestExpenseSummaryByCategory(unittest.TestCase):
         summary = self.budget_tracker.get_category_summary()
         
         # Verify the category totals
-        expected_summary = {
-            "Groceries": Decimal("71.74"),
-            "Transportation": Decimal("12.50"),
-            "Dining": Decimal("30.00")
-        }
-        self.assertEqual(summary, expected_summary)
+        self.assertEqual(summary, EXPECTED_CATEGORY_SUMMARY)
         
         # Verify the total expenses
         total = self.budget_tracker.get_total_expenses()
-        self.assertEqual(total, Decimal("114.24"))
+        self.assertEqual(total, EXPECTED_TOTAL)
+        
+        # Verify the summary and total can be fetched together
+        self.assertEqual(self.budget_tracker.get_summary(), (summary, total))
     
     def test_filter_expense_summary_by_date_range(self):
         """
@@ -264,30 +482,105 @@ class TestExpenseSummaryByCategory(unittest.TestCase):
         )
         
         # Execute the action: get the filtered category summary
-        start_date = datetime(2025, 4, 1)
-        end_date = datetime(2025, 4, 2)
+        start_date = APRIL_1
+        end_date = APRIL_2
         filtered_summary = self.budget_tracker.get_category_summary(
             start_date=start_date,
             end_date=end_date
         )
         
-        # Verify the filtered category totals
-        expected_filtered_summary = {
-            "Groceries": Decimal("71.74"),
-            "Transportation": Decimal("12.50"),
-            "Dining": Decimal("30.00")
-        }
-        self.assertEqual(filtered_summary, expected_filtered_summary)
+        # Verify the filtered category totals exclude the March expense
+        self.assertEqual(filtered_summary, EXPECTED_CATEGORY_SUMMARY)
         
         # Verify the filtered total expenses
         filtered_total = self.budget_tracker.get_total_expenses(
             start_date=start_date,
             end_date=end_date
         )
-        self.assertEqual(filtered_total, Decimal("114.24"))
+        self.assertEqual(filtered_total, EXPECTED_TOTAL)
     
-    @patch('builtins.open', create=True)
-    def test_export_expense_summary(self, mock_open):
+    def test_filter_expense_summary_by_empty_date_range(self):
+        """
+        Test filtering expense summary by a date range with no expenses.
+        
+        Scenario: Filter expense summary by an empty date range
+            Given I have expenses on "2025-04-01" and "2025-04-02"
+            When I set the date range from "2025-05-01" to "2025-05-31"
+            Then I should see no category totals
+            And the total expenses should be "0.00"
+        """
+        # Execute the action: get the summary for a range with no expenses
+        start_date = datetime(2025, 5, 1)
+        end_date = datetime(2025, 5, 31)
+        summary = self.budget_tracker.get_category_summary(start_date, end_date)
+        total = self.budget_tracker.get_total_expenses(start_date, end_date)
+        
+        # Verify the total is a two-place Decimal rather than an int zero
+        self.assertEqual(summary, {})
+        self.assertIsInstance(total, Decimal)
+        self.assertEqual(str(total), "0.00")
+    
+    def test_expense_summary_reflects_changes(self):
+        """
+        Test that the expense summary is refreshed after expenses change.
+        
+        Scenario: View the summary again after changing expenses
+            Given I have viewed my expense summary by category
+            When I add, edit, or delete an expense
+            And I navigate to the "Summary" page again
+            Then the category totals should reflect the change
+        """
+        # View the summary once so it is computed
+        self.assertEqual(self.budget_tracker.get_total_expenses(), EXPECTED_TOTAL)
+        
+        # Add an expense and verify the totals include it
+        expense = self.budget_tracker.add_expense(
+            amount=Decimal("10.00"),
+            category="Dining",
+            date=APRIL_2,
+            description="Coffee"
+        )
+        self.assertEqual(self.budget_tracker.get_category_summary()["Dining"], Decimal("40.00"))
+        self.assertEqual(self.budget_tracker.get_total_expenses(), Decimal("124.24"))
+        
+        # Edit the expense and verify the totals follow
+        self.budget_tracker.update_expense(expense.id, amount=Decimal("5.00"))
+        self.assertEqual(self.budget_tracker.get_category_summary()["Dining"], Decimal("35.00"))
+        
+        # Delete the expense and verify the original totals are restored
+        self.budget_tracker.delete_expense(expense.id)
+        self.assertEqual(self.budget_tracker.get_category_summary()["Dining"], Decimal("30.00"))
+        self.assertEqual(self.budget_tracker.get_total_expenses(), EXPECTED_TOTAL)
+    
+    def test_filter_expenses_by_date_range_after_edit(self):
+        """
+        Test that date-range filtering follows edits to an expense date.
+        
+        Scenario: Move an expense out of the selected date range
+            Given I have expenses on "2025-04-01" and "2025-04-02"
+            When I change the date of "Lunch with team" to "2025-03-20"
+            And I set the date range from "2025-04-01" to "2025-04-02"
+            Then I should see the remaining expenses ordered by date
+            And "Lunch with team" should not be listed
+        """
+        # Move one expense out of the range
+        lunch = self.budget_tracker.get_expenses_by_category("Dining")[0]
+        self.budget_tracker.update_expense(lunch.id, date=datetime(2025, 3, 20))
+        
+        # Execute the action: get the expenses within the date range
+        expenses = self.budget_tracker.get_expenses(
+            start_date=APRIL_1,
+            end_date=APRIL_2
+        )
+        
+        # Verify the edited expense is excluded and the rest are in date order
+        self.assertNotIn(lunch, expenses)
+        self.assertEqual(
+            [expense.description for expense in expenses],
+            ["Weekly groceries", "Bus fare", "Fruits and snacks"]
+        )
+    
+    def test_export_expense_summary(self):
         """
         Test exporting expense summary.
         
@@ -298,12 +591,65 @@ class TestExpenseSummaryByCategory(unittest.TestCase):
             Then a CSV file should be downloaded
             And the file should contain all my expense summary data
         """
-        # Execute the action: export the summary
-        filename = "expense_summary.csv"
-        self.budget_tracker.export_summary(format="CSV", filename=filename)
+        with tempfile.TemporaryDirectory() as directory:
+            # Execute the action: export the summary
+            filename = os.path.join(directory, "expense_summary.csv")
+            self.budget_tracker.export_summary(format="CSV", filename=filename)
+            
+            # Verify the file holds the header and a row for each expense
+            with open(filename, newline='') as csvfile:
+                rows = list(csv.reader(csvfile))
+        self.assertEqual(rows[0], ['ID', 'Amount', 'Category', 'Date', 'Description'])
+        self.assertEqual([row[1:] for row in rows[1:]], [
+            ['45.99', 'Groceries', '2025-04-01', 'Weekly groceries'],
+            ['12.50', 'Transportation', '2025-04-01', 'Bus fare'],
+            ['30.00', 'Dining', '2025-04-02', 'Lunch with team'],
+            ['25.75', 'Groceries', '2025-04-02', 'Fruits and snacks'],
+        ])
+    
+    def test_export_expense_summary_compressed(self):
+        """
+        Test exporting expense summary to a gzip-compressed file.
         
-        # Verify the file was opened for writing
-        mock_open.assert_called_once_with(filename, 'w', newline='')
+        Scenario: Export a compressed expense summary
+            Given I am viewing my expense summary by category
+            When I export the summary as CSV to "expense_summary.csv.gz"
+            Then a compressed CSV file should be written
+            And it should contain a row for each of my expenses
+        """
+        # The filename may be given as a string or a path
+        for to_filename in (str, Path):
+            with self.subTest(filename_type=to_filename.__name__):
+                with tempfile.TemporaryDirectory() as directory:
+                    # Execute the action: export the summary to a .gz file
+                    filename = to_filename(os.path.join(directory, "expense_summary.csv.gz"))
+                    self.budget_tracker.export_summary(format="CSV", filename=filename)
+                    
+                    # Verify the file decompresses to the header and expense rows
+                    with gzip.open(filename, 'rt', newline='') as csvfile:
+                        rows = list(csv.reader(csvfile))
+                self.assertEqual(rows[0], ['ID', 'Amount', 'Category', 'Date', 'Description'])
+                self.assertEqual(len(rows), 5)
+                self.assertIn("Weekly groceries", [row[4] for row in rows])
+    
+    def test_stream_expense_summary_export(self):
+        """
+        Test streaming the expense summary export in chunks.
+        
+        Scenario: Download a large expense summary
+            Given I am viewing my expense summary by category
+            When I download the summary as CSV
+            Then the file should arrive in chunks as it is generated
+            And it should match the exported CSV file
+        """
+        # Execute the action: stream the export two rows at a time
+        chunks = list(self.budget_tracker.export_to_csv_stream(chunk_rows=2))
+        
+        # Verify the rows are split across chunks and match a direct export
+        csvfile = io.StringIO()
+        self.budget_tracker.export_to_csv(csvfile)
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(b"".join(chunks).decode("utf-8"), csvfile.getvalue())
     
     def test_view_expense_breakdown_within_category(self):
         """
@@ -323,12 +669,33 @@ class TestExpenseSummaryByCategory(unittest.TestCase):
         
         # Calculate the total and verify it matches the expected value
         category_total = sum(expense.amount for expense in category_expenses)
-        self.assertEqual(category_total, Decimal("71.74"))
+        self.assertEqual(category_total, EXPECTED_CATEGORY_SUMMARY["Groceries"])
         
         # Verify the expense descriptions
         descriptions = [expense.description for expense in category_expenses]
         self.assertIn("Weekly groceries", descriptions)
         self.assertIn("Fruits and snacks", descriptions)
+    
+    def test_filter_expenses_by_category_and_date_range(self):
+        """
+        Test filtering expenses by category and date range together.
+        
+        Scenario: View a category breakdown for a date range
+            Given I am viewing my expense summary by category
+            When I click on the "Groceries" category
+            And I set the date range from "2025-04-02" to "2025-04-02"
+            Then I should only see "Groceries" expenses within the selected date range
+        """
+        # Execute the action: get expenses filtered by category and date
+        expenses = self.budget_tracker.get_expenses(
+            start_date=APRIL_2,
+            end_date=APRIL_2,
+            category="Groceries"
+        )
+        
+        # Verify only the matching expense is returned
+        self.assertEqual(len(expenses), 1)
+        self.assertEqual(expenses[0].description, "Fruits and snacks")
 
 
 if __name__ == '__main__':